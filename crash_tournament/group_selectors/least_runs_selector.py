@@ -21,13 +21,15 @@ logger = get_logger("least_runs_selector")
 class LeastRunsSelector(Selector):
     """Selector that prioritizes crashes with fewer evaluations."""
 
-    def __init__(self, ranker: Ranker):
+    def __init__(self, ranker: Ranker, seed: int | None = None):
         """Initialize least-runs selector.
 
         Args:
             ranker: Ranker instance to query evaluation counts
+            seed: Random seed for reproducible tie-breaking (None = unseeded)
         """
         self.ranker = ranker
+        self._rng = random.Random(seed)
 
     @override
     def select_matchup(
@@ -53,7 +55,7 @@ class LeastRunsSelector(Selector):
         matchup: list[str] = []
         for count in sorted_counts:
             available = buckets[count]
-            random.shuffle(available)  # Randomize within bucket
+            self._rng.shuffle(available)  # Randomize within bucket
 
             needed = matchup_size - len(matchup)
             matchup.extend(available[:needed])
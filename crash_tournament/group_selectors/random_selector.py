@@ -19,15 +19,17 @@ logger = get_logger("random_selector")
 class RandomSelector(Selector):
     """Random matchup selector - for testing/baseline."""
 
-    def __init__(self, ranker: Ranker):
+    def __init__(self, ranker: Ranker, seed: int | None = None):
         """Initialize random selector.
 
         Args:
             ranker: Ranker instance (not used by RandomSelector but kept for interface
                    consistency with future selectors like UncertaintySelector that will
                    need access to ranking data for intelligent selection)
+            seed: Random seed for reproducible matchups (None = unseeded)
         """
         self.ranker = ranker
+        self._rng = random.Random(seed)
 
     @override
     def select_matchup(
@@ -39,6 +41,6 @@ class RandomSelector(Selector):
             return None
 
         size = min(matchup_size, len(all_crash_ids))
-        matchup = random.sample(list(all_crash_ids), size)
+        matchup = self._rng.sample(list(all_crash_ids), size)
         logger.debug(f"Selected random matchup of size {size}: {matchup}")
         return matchup
@@ -79,6 +79,11 @@ class Storage(ABC):
         """Persist a matchup evaluation result."""
         pass
 
+    def persist_matchup_results_batch(self, results: Iterable[OrdinalResult]) -> None:
+        """Persist several matchup results; storages may override to batch I/O."""
+        for res in results:
+            self.persist_matchup_result(res)
+
     @abstractmethod
     def persist_judge_output(self, res: OrdinalResult) -> None:
         """Persist judge output data to dedicated file."""
@@ -103,6 +108,10 @@ class Storage(ABC):
         """Load system state snapshot."""
         pass
 
+    def close(self) -> None:
+        """Release any open resources; storages that buffer writes flush first."""
+        pass
+
 
 class Ranker(ABC):
     """Interface for ranking crashes by exploitability."""
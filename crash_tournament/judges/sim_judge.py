@@ -21,17 +21,24 @@ class SimulatedJudge(Judge):
     Samples k-way orderings from ground truth scores with added noise.
     """
 
-    def __init__(self, ground_truth: dict[str, float], noise: float = 0.1):
+    def __init__(
+        self,
+        ground_truth: dict[str, float],
+        noise: float = 0.1,
+        seed: int | None = None,
+    ):
         """
         Initialize simulated judge.
 
         Args:
             ground_truth: Dict mapping crash_id to true exploitability score
             noise: Amount of noise to add (0-1, where 1 = full noise)
+            seed: Random seed for reproducible noise (None = unseeded)
         """
         self.ground_truth = ground_truth
         self.noise = max(0.0, min(1.0, noise))  # Clamp to [0, 1]
         self.judge_id = "simulated"
+        self._rng = random.Random(seed)
 
     def _add_noise(self, score: float) -> float:
         """Add Gaussian noise to score."""
@@ -40,7 +47,7 @@ class SimulatedJudge(Judge):
 
         # Scale noise by score magnitude
         noise_scale = abs(score) * self.noise
-        noise = random.gauss(0, noise_scale)
+        noise = self._rng.gauss(0, noise_scale)
         return score + noise
 
     def _get_noisy_scores(self, crashes: Sequence[Crash]) -> list[tuple[Crash, float]]:
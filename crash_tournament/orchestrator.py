@@ -90,6 +90,14 @@ class Orchestrator:
 
     def run(self) -> dict[str, float]:
         """Run tournament using just-in-time work queue pattern."""
+        try:
+            return self._run_tournament()
+        finally:
+            # Write out buffered observations now rather than at GC time
+            self.storage.close()
+
+    def _run_tournament(self) -> dict[str, float]:
+        """Resume, evaluate matchups until the budget is spent, and snapshot."""
         logger.info(f"Starting crash tournament with config: {self.config}")
         print(f"Starting crash tournament with config: {self.config}")
 
@@ -4,7 +4,9 @@ TrueSkill ranker implementation.
 Uses trueskill package with k-way to pairwise conversion and proper weighting.
 """
 
-from trueskill import Rating, rate_1vs1, setup
+import math
+
+from trueskill import Rating, TrueSkill, calc_draw_margin
 from typing_extensions import override
 
 from ..interfaces import Ranker, RankerState
@@ -55,8 +57,12 @@ class TrueSkillRanker(Ranker):
         self.rankings = dict[str, list[int]]()  # All rankings for each crash
         self.group_sizes = dict[str, list[int]]()  # Group sizes for each evaluation
 
-        # Configure trueskill
-        setup(mu=mu, sigma=sigma, tau=tau)
+        # Private trueskill environment (v/w functions, beta, draw margin);
+        # the global one is never touched
+        self._env = TrueSkill(mu=mu, sigma=sigma, tau=tau)
+        self._draw_margin: float = calc_draw_margin(
+            self._env.draw_probability, 2, self._env
+        )
         logger.info(f"TrueSkill ranker initialized: mu={mu}, sigma={sigma}, tau={tau}")
 
     def _get_or_create_rating(self, crash_id: str) -> Rating:
@@ -105,6 +111,10 @@ class TrueSkillRanker(Ranker):
             self.rankings[crash_id].append(rank + 1)  # 1-based ranking
             self.group_sizes[crash_id].append(group_size)
 
+        # Apply weight by adjusting tau (dynamic factor)
+        # Lower weight = more conservative updates (dampen tau)
+        adjusted_tau = self.tau * weight if weight > 0 else self.tau
+
         # Convert k-way to k-1 sequential pairwise wins
         for i in range(len(ordered_ids) - 1):
             winner_id = ordered_ids[i]
@@ -114,23 +124,9 @@ class TrueSkillRanker(Ranker):
             winner_rating = self._get_or_create_rating(winner_id)
             loser_rating = self._get_or_create_rating(loser_id)
 
-            # Apply weight by adjusting tau (dynamic factor)
-            # Lower weight = more conservative updates (dampen tau)
-            adjusted_tau = self.tau * weight if weight > 0 else self.tau
-
-            # Update ratings with adjusted tau
-            # NOTE: This modifies global TrueSkill state, but it's NOT a thread safety issue
-            # because TrueSkillRanker is only accessed from the main thread. The orchestrator
-            # uses ThreadPoolExecutor for judge evaluations, but all ranker operations
-            # (update_with_ordinal, get_score, etc.) are explicitly called from the main
-            # thread in _process_completed_futures() to ensure thread safety.
-            original_tau = self.tau
-            setup(mu=self.mu, sigma=self.sigma, tau=adjusted_tau)
-
-            new_winner, new_loser = rate_1vs1(winner_rating, loser_rating, drawn=False)  # type: ignore[misc]
-
-            # Restore original tau
-            setup(mu=self.mu, sigma=self.sigma, tau=original_tau)
+            new_winner, new_loser = self._rate_1vs1(
+                winner_rating, loser_rating, adjusted_tau
+            )
 
             # Update stored ratings
             self.ratings[winner_id] = new_winner
@@ -144,6 +140,36 @@ class TrueSkillRanker(Ranker):
                 f"  {loser_id}: {loser_rating.mu:.2f}->{new_loser.mu:.2f} (σ: {loser_rating.sigma:.2f}->{new_loser.sigma:.2f})"
             )  # type: ignore[attr-defined]
 
+    def _rate_1vs1(
+        self, winner: Rating, loser: Rating, tau: float
+    ) -> tuple[Rating, Rating]:
+        """Closed-form TrueSkill update for a single win (no draw).
+
+        Equivalent to trueskill.rate_1vs1 under an environment with the given
+        tau: with one player per team the factor graph has a single
+        comparison, so its message passing reduces to these few lines, run
+        without building the graph.
+        """
+        winner_var = winner.sigma**2 + tau**2  # type: ignore[attr-defined]
+        loser_var = loser.sigma**2 + tau**2  # type: ignore[attr-defined]
+        c_squared = 2 * self._env.beta**2 + winner_var + loser_var
+        c = math.sqrt(c_squared)
+
+        diff = (winner.mu - loser.mu) / c  # type: ignore[attr-defined]
+        draw_margin = self._draw_margin / c
+        v = self._env.v_win(diff, draw_margin)
+        w = self._env.w_win(diff, draw_margin)
+
+        new_winner = Rating(
+            mu=winner.mu + winner_var / c * v,  # type: ignore[attr-defined]
+            sigma=math.sqrt(winner_var * (1 - winner_var / c_squared * w)),
+        )
+        new_loser = Rating(
+            mu=loser.mu - loser_var / c * v,  # type: ignore[attr-defined]
+            sigma=math.sqrt(loser_var * (1 - loser_var / c_squared * w)),
+        )
+        return new_winner, new_loser
+
     @override
     def get_score(self, crash_id: str) -> float:
         """Get current score (mu) for a crash."""
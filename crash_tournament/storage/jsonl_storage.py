@@ -5,13 +5,19 @@ Persists observations to JSONL file and snapshots to both JSON file and JSONL fi
 Includes checksums and timestamps for data integrity.
 """
 
-import json
+import hashlib
+import itertools
+import mmap
+import os
+import threading
 import typing
-from collections.abc import Iterable
+import zlib
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
-from typing_extensions import override
+import orjson
+from typing_extensions import Self, override
 
 from ..interfaces import Storage, SystemState
 from ..logging_config import get_logger
@@ -20,6 +26,110 @@ from ..models import OrdinalResult
 # Module-level logger
 logger = get_logger("jsonl_storage")
 
+# Buffer size for long-lived append handles
+APPEND_BUFFER_SIZE = 1 << 20
+
+# Read size when counting observation lines
+COUNT_CHUNK_SIZE = 1 << 20
+
+# Snapshots at least this large are parsed straight from an mmap
+SNAPSHOT_MMAP_THRESHOLD = 64 * 1024
+
+# Every record ends with `,"checksum":"<crc32 hex>"}`; the CRC32 covers the
+# record serialized without that field (i.e. with `}` in place of the suffix)
+_CHECKSUM_PREFIX = b',"checksum":"'
+_CHECKSUM_SUFFIX_LEN = len(_CHECKSUM_PREFIX) + 8 + len(b'"}')
+
+# Bytes that bytes.strip() removes; a line made only of these is blank
+_BLANK_LINE_BYTES = b" \t\r\x0b\x0c"
+
+
+def _with_checksum(body: bytes) -> bytes:
+    """Append a CRC32 checksum field to a serialized JSON object."""
+    return b'%s%s%08x"}\n' % (body[:-1], _CHECKSUM_PREFIX, zlib.crc32(body))
+
+
+def _has_checksum(line: bytes) -> bool:
+    """Whether a record ends with a well-formed checksum field."""
+    suffix = line[-_CHECKSUM_SUFFIX_LEN:]
+    return suffix.startswith(_CHECKSUM_PREFIX) and suffix.endswith(b'"}')
+
+
+def _checksum_matches(line: bytes) -> bool:
+    """Verify a record's CRC32 checksum; records without one are accepted."""
+    if not _has_checksum(line):
+        # Only records with no checksum key at all are legacy; a checksum key
+        # without a well-formed trailing field means the field was damaged.
+        if b'"checksum"' not in line:
+            return True
+        try:
+            record = typing.cast(object, orjson.loads(line))
+        except orjson.JSONDecodeError:
+            return False
+        return not (isinstance(record, dict) and "checksum" in record)
+    suffix = line[-_CHECKSUM_SUFFIX_LEN:]
+    body = line[:-_CHECKSUM_SUFFIX_LEN] + b"}"
+    try:
+        expected = int(suffix[len(_CHECKSUM_PREFIX) : -2], 16)
+    except ValueError:
+        return False
+    return zlib.crc32(body) == expected
+
+
+def _encode_record(res: OrdinalResult) -> bytes:
+    """Serialize a result as one checksummed JSONL line."""
+    # orjson serializes dataclasses natively, in field order, without an
+    # intermediate dict
+    return _with_checksum(orjson.dumps(res))
+
+
+def _map_for_sequential_read(fd: int) -> mmap.mmap:
+    """Map a whole file read-only, hinting the kernel to read ahead."""
+    mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    # Parsing walks the mapping front to back once
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    return mm
+
+
+def _encode_snapshot(state: SystemState) -> dict[str, object]:
+    """
+    Convert a snapshot to its on-disk layout.
+
+    Ratings are stored column-wise (`rating_columns`: parallel `ids`, `mu` and
+    `sigma` lists) instead of one `{"mu", "sigma"}` object per crash; every
+    other key is written unchanged.
+    """
+    ranker_state = state["ranker_state"]
+    ratings = ranker_state["ratings"]
+    return {
+        **state,
+        "ranker_state": {
+            **{key: value for key, value in ranker_state.items() if key != "ratings"},
+            "rating_columns": {
+                "ids": list(ratings),
+                "mu": [rating["mu"] for rating in ratings.values()],
+                "sigma": [rating["sigma"] for rating in ratings.values()],
+            },
+        },
+    }
+
+
+def _decode_rating_columns(ranker_state: dict[str, object]) -> None:
+    """Rebuild per-crash `ratings` in place from a column-wise snapshot."""
+    if "rating_columns" not in ranker_state:
+        return
+    columns = ranker_state.pop("rating_columns")
+    assert isinstance(columns, dict), "ranker_state.rating_columns must be a dict"
+    columns = typing.cast(dict[str, list[object]], columns)
+    assert {"ids", "mu", "sigma"} <= columns.keys(), "rating columns are incomplete"
+    ids, mus, sigmas = columns["ids"], columns["mu"], columns["sigma"]
+    assert len(ids) == len(mus) == len(sigmas), "rating columns differ in length"
+    ranker_state["ratings"] = {
+        crash_id: {"mu": mu, "sigma": sigma}
+        for crash_id, mu, sigma in zip(ids, mus, sigmas)
+    }
+
 
 class JSONLStorage(Storage):
     """
@@ -27,18 +137,24 @@ class JSONLStorage(Storage):
 
     Uses JSONL file for observations (append-only) and both JSON file and JSONL file for snapshots.
     Includes checksums and timestamps for data integrity.
+
+    Appends go through long-lived buffered handles; call flush() (or close())
+    to make them visible to other readers. Reads and snapshot saves flush
+    first, so the observation log is never behind a saved snapshot.
     """
 
     observations_path: Path
     snapshot_path: Path
     snapshots_jsonl_path: Path
     judge_outputs_path: Path
+    fsync: bool
 
     def __init__(
         self,
         observations_path: Path,
         snapshot_path: Path,
         judge_outputs_path: Path | None = None,
+        fsync: bool = False,
     ):
         """
         Initialize JSONL storage.
@@ -47,6 +163,7 @@ class JSONLStorage(Storage):
             observations_path: Path to JSONL file for observations
             snapshot_path: Path to JSON file for latest snapshot
             judge_outputs_path: Path to JSONL file for judge outputs (optional)
+            fsync: Whether flush() and snapshot writes should also fsync
         """
         self.observations_path = Path(observations_path)
         self.snapshot_path = Path(snapshot_path)
@@ -61,6 +178,23 @@ class JSONLStorage(Storage):
         else:
             self.judge_outputs_path = Path(judge_outputs_path)
 
+        self.fsync = fsync
+
+        # Buffered append handles, opened lazily per file
+        self._handles = dict[Path, BinaryIO]()
+
+        # Guards the handles and the observation count so results can be
+        # persisted from several threads; reentrant because appends count
+        # (and so flush) on first use
+        self._lock = threading.RLock()
+
+        # Observation count, read from the file on first use and then
+        # maintained by appends and clears
+        self._count: int | None = None
+
+        # Digest of the last snapshot written, to skip unchanged rewrites
+        self._last_snapshot_digest: bytes | None = None
+
         # Ensure parent directories exist
         self.observations_path.parent.mkdir(parents=True, exist_ok=True)
         self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
@@ -75,110 +209,110 @@ class JSONLStorage(Storage):
         """Persist an ordinal evaluation result to JSONL."""
         logger.debug(f"Persisting ordinal result: {res.ordered_ids}")
 
-        # Convert dataclass to dict
-        data = {
-            "ordered_ids": res.ordered_ids,
-            "raw_output": res.raw_output,
-            "parsed_result": res.parsed_result,
-            "timestamp": res.timestamp,
-            "judge_id": res.judge_id,
-        }
-
-        # Append to JSONL file
-        with open(self.observations_path, "a", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False)
-            f.write("\n")
+        # Serialize once; the judge outputs file gets the same record
+        line = _encode_record(res)
+        with self._lock:
+            if self._count is None:
+                self._count = self._count_observations_in_file()
+            self._write(self.observations_path, line)
+            self._write(self.judge_outputs_path, line)
+            self._count += 1
 
         logger.debug(
-            f"Successfully persisted ordinal result to {self.observations_path}"
+            f"Successfully persisted ordinal result to {self.observations_path} and {self.judge_outputs_path}"
         )
 
-        # Also persist to judge outputs file
-        self.persist_judge_output(res)
+    @override
+    def persist_matchup_results_batch(self, results: Iterable[OrdinalResult]) -> None:
+        """
+        Persist several ordinal results with one write per file.
+
+        The batch is flushed (and fsynced if enabled) before returning.
+        """
+        batch = b"".join(_encode_record(res) for res in results)
+        if not batch:
+            return
+        batch_size = batch.count(b"\n")
+        logger.debug(f"Persisting batch of {batch_size} ordinal results")
+
+        with self._lock:
+            if self._count is None:
+                self._count = self._count_observations_in_file()
+            for path in (self.observations_path, self.judge_outputs_path):
+                self._write(path, batch)
+            self._count += batch_size
+            self.flush()
 
     @override
     def persist_judge_output(self, res: OrdinalResult) -> None:
         """Persist judge output data to dedicated JSONL file."""
         logger.debug(f"Persisting judge output: {res.ordered_ids}")
 
-        # Convert dataclass to dict (same format as observations)
-        data = {
-            "ordered_ids": res.ordered_ids,
-            "raw_output": res.raw_output,
-            "parsed_result": res.parsed_result,
-            "timestamp": res.timestamp,
-            "judge_id": res.judge_id,
-        }
-
-        # Append to judge outputs JSONL file
-        with open(self.judge_outputs_path, "a", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False)
-            f.write("\n")
+        # Append to judge outputs JSONL file (same format as observations)
+        self._write(self.judge_outputs_path, _encode_record(res))
 
         logger.debug(
             f"Successfully persisted judge output to {self.judge_outputs_path}"
         )
 
     @override
-    def load_observations(self) -> Iterable[OrdinalResult]:
-        """Load all persisted ordinal results from JSONL."""
-        if not self.observations_path.exists():
-            return
+    def load_observations(self, verify: bool = False) -> Iterable[OrdinalResult]:
+        """
+        Load all persisted ordinal results from JSONL.
 
-        with open(self.observations_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    data = typing.cast(dict[str, Any], json.loads(line))  # pyright: ignore[reportExplicitAny]
-
-                    # Validate required fields exist and have correct types
-                    assert "ordered_ids" in data, "Missing required field: ordered_ids"
-                    assert "raw_output" in data, "Missing required field: raw_output"
-                    assert "judge_id" in data, "Missing required field: judge_id"
-
-                    # Assert field types and cast immediately
-                    assert isinstance(data["ordered_ids"], list), (
-                        "ordered_ids must be a list"
-                    )
-                    # Validate list contents are strings
-                    ordered_ids = typing.cast(list[str], data["ordered_ids"])
-                    raw_output = typing.cast(str, data["raw_output"])
-                    judge_id = typing.cast(str, data["judge_id"])
-
-                    # Validate optional fields if present
-                    parsed_result: dict[str, object] = {}
-                    if "parsed_result" in data:
-                        assert isinstance(data["parsed_result"], dict), (
-                            "parsed_result must be a dictionary"
-                        )
-                        parsed_result = typing.cast(
-                            dict[str, object], data["parsed_result"]
-                        )
-
-                    timestamp = 0.0
-                    if "timestamp" in data:
-                        assert isinstance(data["timestamp"], (int, float)), (
-                            "timestamp must be a number"
-                        )
-                        timestamp = float(data["timestamp"])
-
-                    # Create OrdinalResult with validated and cast data
-                    yield OrdinalResult(
-                        ordered_ids=ordered_ids,
-                        raw_output=raw_output,
-                        parsed_result=parsed_result,
-                        timestamp=timestamp,
-                        judge_id=judge_id,
-                    )
-                except (json.JSONDecodeError, AssertionError) as e:
-                    # Skip corrupted or invalid lines
-                    logger.warning(
-                        f"Skipping invalid JSON line in {self.observations_path}: {e}"
-                    )
-                    continue
+        Args:
+            verify: Also check each record's checksum and skip mismatches.
+                Lines that are not valid JSON are skipped either way.
+        """
+        self.flush()
+        for _, line in self._iter_observation_lines():
+            result = self._decode_observation(line, verify)
+            if result is not None:
+                yield result
+
+    def load_observations_batch(
+        self, chunk_size: int = 1024, verify: bool = False
+    ) -> Iterator[list[OrdinalResult]]:
+        """
+        Load persisted ordinal results in lists of up to chunk_size.
+
+        Lets bulk consumers (e.g. replaying a log into a ranker) work a chunk
+        at a time instead of pulling one result per generator step.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        observations = iter(self.load_observations(verify))
+        while chunk := list(itertools.islice(observations, chunk_size)):
+            yield chunk
+
+    def validate_observations(self) -> tuple[int, list[int]]:
+        """
+        Check every observation record without loading the log.
+
+        Records with a checksum are judged by it alone, without parsing the
+        JSON, and a damaged checksum field makes a record invalid; records
+        written before checksums existed are parsed and validated as in
+        load_observations.
+
+        Returns:
+            Number of valid records and byte offsets of the invalid ones
+        """
+        self.flush()
+        valid_count = 0
+        invalid_offsets = list[int]()
+        for offset, line in self._iter_observation_lines():
+            record = bytes(line).strip()
+            if not _checksum_matches(record):
+                valid = False
+            elif _has_checksum(record):
+                valid = True
+            else:
+                valid = self._decode_observation(record, verify=False) is not None
+            if valid:
+                valid_count += 1
+            else:
+                invalid_offsets.append(offset)
+        return valid_count, invalid_offsets
 
     @override
     def save_snapshot(self, state: SystemState) -> None:
@@ -187,28 +321,49 @@ class JSONLStorage(Storage):
             f"Saving snapshot with ranker_state and runtime_state to {self.snapshot_path}"
         )
 
-        # Write to JSON file (idempotent - latest snapshot)
-        with open(self.snapshot_path, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
+        # Observations backing this state must reach disk before the snapshot does
+        self.flush()
+
+        encoded = _encode_snapshot(state)
+        line = orjson.dumps(encoded, option=orjson.OPT_APPEND_NEWLINE)
+        digest = hashlib.blake2b(line, digest_size=16).digest()
+        if digest == self._last_snapshot_digest and self.snapshot_path.exists():
+            logger.debug("Snapshot unchanged since last save, skipping write")
+            return
+
+        # Write to JSON file (idempotent - latest snapshot). Written to a
+        # sibling temp file and renamed over, so readers never see a torn file.
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(encoded, option=orjson.OPT_INDENT_2))
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
 
         # Append to JSONL file (append-only - historical snapshots)
-        with open(self.snapshots_jsonl_path, "a", encoding="utf-8") as f:
-            json.dump(state, f, ensure_ascii=False)
-            f.write("\n")
+        with open(self.snapshots_jsonl_path, "ab") as f:
+            f.write(line)
+
+        self._last_snapshot_digest = digest
 
         logger.debug("Snapshot saved successfully to both JSON and JSONL files")
 
     @override
     def load_snapshot(self) -> SystemState | None:
         """Load system state snapshot from JSON."""
-        if not self.snapshot_path.exists():
+        try:
+            raw_data = self._read_snapshot_json()
+        except FileNotFoundError:
             logger.debug("No snapshot file exists")
             return None
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to load snapshot from {self.snapshot_path}: {e}")
+            return None
 
         logger.info(f"Loading snapshot from {self.snapshot_path}")
         try:
-            with open(self.snapshot_path, "r", encoding="utf-8") as f:
-                data = typing.cast(dict[str, Any], json.load(f))  # pyright: ignore[reportExplicitAny]
+            data = typing.cast(dict[str, Any], raw_data)  # pyright: ignore[reportExplicitAny]
 
             # Validate that the loaded data has the required SystemState structure
             assert "ranker_state" in data, "Missing required field: ranker_state"
@@ -224,6 +379,7 @@ class JSONLStorage(Storage):
 
             # Validate ranker_state structure
             ranker_state_data = typing.cast(dict[str, object], data["ranker_state"])
+            _decode_rating_columns(ranker_state_data)
             assert "ratings" in ranker_state_data, (
                 "Missing required field: ranker_state.ratings"
             )
@@ -243,30 +399,182 @@ class JSONLStorage(Storage):
             # Create SystemState with validated data - use cast through object to avoid type checker issues
             return typing.cast(SystemState, typing.cast(object, data))
 
-        except (json.JSONDecodeError, AssertionError) as e:
+        except AssertionError as e:
             logger.error(f"Failed to load snapshot from {self.snapshot_path}: {e}")
             return None
 
     def clear_observations(self) -> None:
         """Clear all observations (for testing)."""
-        if self.observations_path.exists():
-            self.observations_path.unlink()
+        # Close the append handle first so no fd keeps the unlinked inode alive
+        with self._lock:
+            self._close_handle(self.observations_path)
+            self.observations_path.unlink(missing_ok=True)
+            self._count = 0
 
     def clear_snapshot(self) -> None:
         """Clear snapshot (for testing)."""
-        if self.snapshot_path.exists():
-            self.snapshot_path.unlink()
-        if self.snapshots_jsonl_path.exists():
-            self.snapshots_jsonl_path.unlink()
+        self._last_snapshot_digest = None
+        self.snapshot_path.unlink(missing_ok=True)
+        self.snapshots_jsonl_path.unlink(missing_ok=True)
 
     def get_observation_count(self) -> int:
         """Get number of stored observations."""
-        if not self.observations_path.exists():
-            return 0
+        with self._lock:
+            if self._count is None:
+                self._count = self._count_observations_in_file()
+            return self._count
+
+    def flush(self) -> None:
+        """Flush buffered appends to disk (and fsync if enabled)."""
+        with self._lock:
+            for handle in self._handles.values():
+                handle.flush()
+                if self.fsync:
+                    os.fsync(handle.fileno())
+
+    @override
+    def close(self) -> None:
+        """Flush and close all append handles."""
+        with self._lock:
+            self.flush()
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+    def __enter__(self) -> Self:
+        """Use the storage as a context manager that closes on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Flush and close all append handles."""
+        self.close()
+
+    def _iter_observation_lines(self) -> Iterator[tuple[int, memoryview]]:
+        """Yield (byte offset, line) for each non-empty line of the log."""
+        try:
+            f = open(self.observations_path, "rb")
+        except FileNotFoundError:
+            return
 
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+
+            # Slice each line in place from the mapped file, instead of
+            # copying the file into bytes and splitting it into a list. The
+            # mapping is not closed explicitly: callers may still hold the
+            # last slice, and it is unmapped once no slice refers to it.
+            mm = _map_for_sequential_read(f.fileno())
+            view = memoryview(mm)
+            start = 0
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                # Skip blank lines, including whitespace-only and CRLF ones;
+                # only lines starting with whitespace are copied to check
+                if end > start and (
+                    mm[start] not in _BLANK_LINE_BYTES or mm[start:end].strip()
+                ):
+                    yield start, view[start:end]
+                start = end + 1
+
+    def _read_snapshot_json(self) -> object:
+        """Parse the latest snapshot file, via mmap when it is large."""
+        with open(self.snapshot_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < SNAPSHOT_MMAP_THRESHOLD:
+                return typing.cast(object, orjson.loads(f.read()))
+            # Parse the mapped pages directly instead of copying into bytes
+            with (
+                _map_for_sequential_read(f.fileno()) as mm,
+                memoryview(mm) as view,
+            ):
+                return typing.cast(object, orjson.loads(view))
+
+    def _count_observations_in_file(self) -> int:
+        """Count observation lines currently in the observations file."""
+        self.flush()
+
+        # Every appended record is exactly one newline-terminated line, so
+        # counting newlines in large chunks avoids splitting or parsing lines
         count = 0
-        with open(self.observations_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    count += 1
+        try:
+            with open(self.observations_path, "rb") as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while chunk := f.read(COUNT_CHUNK_SIZE):
+                    count += chunk.count(b"\n")
+        except FileNotFoundError:
+            return 0
         return count
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Write encoded records to a JSONL file via its buffered handle."""
+        with self._lock:
+            handle = self._handles.get(path)
+            if handle is None:
+                handle = open(path, "ab", buffering=APPEND_BUFFER_SIZE)
+                self._handles[path] = handle
+            handle.write(data)
+
+    def _close_handle(self, path: Path) -> None:
+        """Flush and close the append handle for a file, if open."""
+        handle = self._handles.pop(path, None)
+        if handle is not None:
+            handle.close()
+
+    def _decode_observation(
+        self, line: bytes | memoryview, verify: bool
+    ) -> OrdinalResult | None:
+        """Parse and validate one JSONL observation, or None if it is invalid."""
+        if verify and not _checksum_matches(bytes(line).strip()):
+            logger.warning(
+                f"Skipping observation with bad checksum in {self.observations_path}"
+            )
+            return None
+
+        try:
+            data = typing.cast(dict[str, Any], orjson.loads(line))  # pyright: ignore[reportExplicitAny]
+
+            # Validate required fields exist and have correct types
+            assert "ordered_ids" in data, "Missing required field: ordered_ids"
+            assert "raw_output" in data, "Missing required field: raw_output"
+            assert "judge_id" in data, "Missing required field: judge_id"
+
+            # Assert field types and cast immediately
+            assert isinstance(data["ordered_ids"], list), "ordered_ids must be a list"
+            # Validate list contents are strings
+            ordered_ids = typing.cast(list[str], data["ordered_ids"])
+            raw_output = typing.cast(str, data["raw_output"])
+            judge_id = typing.cast(str, data["judge_id"])
+
+            # Validate optional fields if present
+            parsed_result: dict[str, object] = {}
+            if "parsed_result" in data:
+                assert isinstance(data["parsed_result"], dict), (
+                    "parsed_result must be a dictionary"
+                )
+                parsed_result = typing.cast(dict[str, object], data["parsed_result"])
+
+            timestamp = 0.0
+            if "timestamp" in data:
+                assert isinstance(data["timestamp"], (int, float)), (
+                    "timestamp must be a number"
+                )
+                timestamp = float(data["timestamp"])
+
+            # Create OrdinalResult with validated and cast data
+            return OrdinalResult(
+                ordered_ids=ordered_ids,
+                raw_output=raw_output,
+                parsed_result=parsed_result,
+                timestamp=timestamp,
+                judge_id=judge_id,
+            )
+        except (orjson.JSONDecodeError, AssertionError) as e:
+            # Skip corrupted or invalid lines
+            logger.warning(
+                f"Skipping invalid JSON line in {self.observations_path}: {e}"
+            )
+            return None
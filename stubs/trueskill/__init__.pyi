@@ -157,10 +157,46 @@ class TrueSkill:
         """The draw probability."""
         ...
 
+    def v_win(self, diff: float, draw_margin: float) -> float:
+        """Non-draw "V" function: the variation of a mean.
+
+        Args:
+            diff: Normalized performance difference
+            draw_margin: Normalized draw margin
+        """
+        ...
+
+    def w_win(self, diff: float, draw_margin: float) -> float:
+        """Non-draw "W" function: the variation of a standard deviation.
+
+        Args:
+            diff: Normalized performance difference
+            draw_margin: Normalized draw margin
+
+        Raises:
+            FloatingPointError: If the result falls outside (0, 1)
+        """
+        ...
+
     def __repr__(self) -> str:
         """String representation of the environment."""
         ...
 
+def calc_draw_margin(
+    draw_probability: float, size: int, env: Optional[TrueSkill] = ...
+) -> float:
+    """Calculate the draw margin for a draw probability.
+
+    Args:
+        draw_probability: Probability of a draw
+        size: Total number of players in the two compared teams
+        env: TrueSkill environment (uses global if None)
+
+    Returns:
+        The (unnormalized) draw margin
+    """
+    ...
+
 def rate_1vs1(
     rating1: Rating,
     rating2: Rating,
@@ -0,0 +1,52 @@
+"""
+Shared pytest configuration for the test suite.
+
+Adds a --quick option that trims repetition-heavy parametrizations for
+local iteration; the default run keeps full coverage. Also registers the
+custom markers and holds session-scoped fixtures for read-only state
+shared across modules.
+"""
+
+import pytest
+
+from crash_tournament.interfaces import RankerState
+from crash_tournament.models import OrdinalResult
+from crash_tournament.rankers.trueskill_ranker import TrueSkillRanker
+
+# Update counts for convergence tests; --quick keeps only the first.
+N_UPDATES = (3, 10)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--quick",
+        action="store_true",
+        default=False,
+        help="run only the cheapest case of repetition-heavy tests",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "integration: needs external tools such as the cursor-agent CLI"
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "n_updates" in metafunc.fixturenames:
+        quick = bool(metafunc.config.getoption("quick"))
+        metafunc.parametrize("n_updates", N_UPDATES[:1] if quick else N_UPDATES)
+
+
+@pytest.fixture(scope="session")
+def updated_ranker() -> tuple[TrueSkillRanker, RankerState]:
+    """Ranker updated once with a > b > c, plus its snapshot; read-only."""
+    ranker = TrueSkillRanker()
+    ranker.update_with_ordinal(
+        OrdinalResult(
+            ordered_ids=["a", "b", "c"],
+            raw_output="test",
+            parsed_result={"rationale_top": "a > b > c"},
+        )
+    )
+    return ranker, ranker.snapshot()
@@ -4,4 +4,44 @@ Unit tests for selector implementations.
 TODO: Implement tests for UncertaintySelector
 """
 
-# Placeholder for selector tests
+import pytest
+
+from crash_tournament.group_selectors import LeastRunsSelector, RandomSelector
+from crash_tournament.rankers.trueskill_ranker import TrueSkillRanker
+
+
+class TestSelectorEdgeCases:
+    """Test matchup sizing and fast-exit guards shared by all selectors."""
+
+    @pytest.mark.parametrize("selector_cls", [RandomSelector, LeastRunsSelector])
+    @pytest.mark.parametrize(
+        ("crash_ids", "matchup_size", "expected_size"),
+        [
+            pytest.param([], 2, None, id="empty"),
+            pytest.param(["a"], 2, None, id="single_crash"),
+            pytest.param(["a", "b"], 3, 2, id="fewer_crashes_than_size"),
+            pytest.param(["a", "b", "c"], 2, 2, id="enough_crashes"),
+        ],
+    )
+    def test_matchup_size(
+        self,
+        selector_cls: type[RandomSelector | LeastRunsSelector],
+        crash_ids: list[str],
+        matchup_size: int,
+        expected_size: int | None,
+    ) -> None:
+        """Selectors should return None below 2 crashes and cap size otherwise."""
+        # Arrange
+        selector = selector_cls(TrueSkillRanker(), seed=0)
+
+        # Act
+        matchup = selector.select_matchup(crash_ids, matchup_size)
+
+        # Assert
+        if expected_size is None:
+            assert matchup is None, "Should not form a matchup from < 2 crashes"
+        else:
+            assert matchup is not None, "Should form a matchup"
+            assert len(matchup) == expected_size, "Matchup should be capped"
+            assert len(set(matchup)) == len(matchup), "Crashes should not repeat"
+            assert set(matchup) <= set(crash_ids), "Should only pick given crashes"
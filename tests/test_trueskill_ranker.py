@@ -4,10 +4,25 @@ Tests for TrueSkillRanker implementation.
 Focus on k-way to pairwise conversion and ranking updates.
 """
 
+from collections.abc import Callable
+
+import pytest
+from trueskill import Rating, TrueSkill, rate_1vs1
+
+from crash_tournament.interfaces import RankerState
 from crash_tournament.models import OrdinalResult
 from crash_tournament.rankers.trueskill_ranker import TrueSkillRanker
 
 
+def _ordinal(*ordered_ids: str) -> OrdinalResult:
+    """Build a judge-free OrdinalResult ranking ordered_ids best-first."""
+    return OrdinalResult(
+        ordered_ids=list(ordered_ids),
+        raw_output="test",
+        parsed_result={"rationale_top": " > ".join(ordered_ids)},
+    )
+
+
 class TestTrueSkillRanker:
     """Test TrueSkillRanker behavior through public interface."""
 
@@ -15,11 +30,7 @@ class TestTrueSkillRanker:
         """Basic 2-way comparison should increase winner score and decrease loser score."""
         # Arrange
         ranker = TrueSkillRanker()
-        result = OrdinalResult(
-            ordered_ids=["winner", "loser"],
-            raw_output="test",
-            parsed_result={"rationale_top": "winner beats loser"},
-        )
+        result = _ordinal("winner", "loser")
 
         # Get initial scores
         initial_winner = ranker.get_score("winner")
@@ -40,11 +51,7 @@ class TestTrueSkillRanker:
         """Verify 4-way [a,b,c,d] correctly updates all ratings in sequence."""
         # Arrange
         ranker = TrueSkillRanker()
-        result = OrdinalResult(
-            ordered_ids=["a", "b", "c", "d"],
-            raw_output="test",
-            parsed_result={"rationale_top": "a > b > c > d"},
-        )
+        result = _ordinal("a", "b", "c", "d")
 
         # Get initial scores
         initial_scores = {
@@ -75,11 +82,7 @@ class TestTrueSkillRanker:
         # Arrange
         ranker1 = TrueSkillRanker()
         ranker2 = TrueSkillRanker()
-        result = OrdinalResult(
-            ordered_ids=["a", "b"],
-            raw_output="test",
-            parsed_result={"rationale_top": "a beats b"},
-        )
+        result = _ordinal("a", "b")
 
         # Act - update with different weights
         ranker1.update_with_ordinal(result, weight=1.0)  # Normal weight
@@ -105,24 +108,19 @@ class TestTrueSkillRanker:
 
         # Assert
         assert score == 25.0, "New crash should get default mu"
-        assert uncertainty == 8.333333333333334, "New crash should get default sigma"
+        assert uncertainty == pytest.approx(25.0 / 3.0), (
+            "New crash should get default sigma"
+        )
 
-    def test_snapshot_and_restore(self) -> None:
+    def test_snapshot_and_restore(
+        self, updated_ranker: tuple[TrueSkillRanker, RankerState]
+    ) -> None:
         """Round-trip serialization should preserve state."""
         # Arrange
-        ranker1 = TrueSkillRanker()
+        ranker1, snapshot = updated_ranker
         ranker2 = TrueSkillRanker()
 
-        # Update ranker1 with some data
-        result = OrdinalResult(
-            ordered_ids=["a", "b", "c"],
-            raw_output="test",
-            parsed_result={"rationale_top": "a > b > c"},
-        )
-        ranker1.update_with_ordinal(result)
-
         # Act
-        snapshot = ranker1.snapshot()
         ranker2.load_snapshot(snapshot)
 
         # Assert
@@ -134,59 +132,44 @@ class TestTrueSkillRanker:
                 crash_id
             ), f"Uncertainties should match for {crash_id}"
 
-    def test_get_score_returns_mu(self) -> None:
-        """get_score should return the mu value."""
+    @pytest.mark.parametrize(
+        ("accessor", "positive_only"),
+        [
+            pytest.param(TrueSkillRanker.get_score, False, id="score"),
+            pytest.param(TrueSkillRanker.get_uncertainty, True, id="uncertainty"),
+        ],
+    )
+    def test_rating_accessors_return_floats(
+        self,
+        updated_ranker: tuple[TrueSkillRanker, RankerState],
+        accessor: Callable[[TrueSkillRanker, str], float],
+        positive_only: bool,
+    ) -> None:
+        """get_score/get_uncertainty should return the mu/sigma floats."""
         # Arrange
-        ranker = TrueSkillRanker()
-        result = OrdinalResult(
-            ordered_ids=["a", "b"],
-            raw_output="test",
-            parsed_result={"rationale_top": "a beats b"},
-        )
-        ranker.update_with_ordinal(result)
+        ranker, _ = updated_ranker
 
         # Act
-        score_a = ranker.get_score("a")
-        score_b = ranker.get_score("b")
+        value_a = accessor(ranker, "a")
+        value_b = accessor(ranker, "b")
 
         # Assert
-        assert isinstance(score_a, float), "Score should be float"
-        assert isinstance(score_b, float), "Score should be float"
-        assert score_a > score_b, "Winner should have higher score"
-
-    def test_get_uncertainty_returns_sigma(self) -> None:
-        """get_uncertainty should return the sigma value."""
-        # Arrange
-        ranker = TrueSkillRanker()
-        result = OrdinalResult(
-            ordered_ids=["a", "b"],
-            raw_output="test",
-            parsed_result={"rationale_top": "a beats b"},
-        )
-        ranker.update_with_ordinal(result)
-
-        # Act
-        uncertainty_a = ranker.get_uncertainty("a")
-        uncertainty_b = ranker.get_uncertainty("b")
-
-        # Assert
-        assert isinstance(uncertainty_a, float), "Uncertainty should be float"
-        assert isinstance(uncertainty_b, float), "Uncertainty should be float"
-        assert uncertainty_a > 0, "Uncertainty should be positive"
-        assert uncertainty_b > 0, "Uncertainty should be positive"
-
-    def test_multiple_updates_converge(self) -> None:
+        assert isinstance(value_a, float), "Accessor should return float"
+        assert isinstance(value_b, float), "Accessor should return float"
+        if positive_only:
+            assert value_a > 0, "Uncertainty should be positive"
+            assert value_b > 0, "Uncertainty should be positive"
+        else:
+            assert value_a > value_b, "Winner should have higher score"
+
+    def test_multiple_updates_converge(self, n_updates: int) -> None:
         """Multiple updates should converge to stable rankings."""
         # Arrange
         ranker = TrueSkillRanker()
+        result = _ordinal("a", "b", "c")
 
         # Act - multiple updates with same ordering
-        for _ in range(10):
-            result = OrdinalResult(
-                ordered_ids=["a", "b", "c"],
-                raw_output="test",
-                parsed_result={"rationale_top": "consistent ordering"},
-            )
+        for _ in range(n_updates):
             ranker.update_with_ordinal(result)
 
         # Assert - ordering should be stable
@@ -200,26 +183,41 @@ class TestTrueSkillRanker:
         assert scores["b"] > scores["c"], "b should rank middle"
         assert scores["a"] > scores["c"], "a should rank higher than c"
 
-    def test_snapshot_contains_all_crashes(self) -> None:
-        """Snapshot should contain all crashes that have been seen."""
+    @pytest.mark.parametrize("weight", [1.0, 0.5])
+    def test_pairwise_update_matches_trueskill_rate_1vs1(self, weight: float) -> None:
+        """Closed-form updates should match trueskill's factor-graph rate_1vs1."""
         # Arrange
         ranker = TrueSkillRanker()
-        result = OrdinalResult(
-            ordered_ids=["x", "y", "z"],
-            raw_output="test",
-            parsed_result={"rationale_top": "x > y > z"},
-        )
-        ranker.update_with_ordinal(result)
+        env = TrueSkill(mu=ranker.mu, sigma=ranker.sigma, tau=ranker.tau * weight)
+        expected = {
+            crash_id: Rating(mu=ranker.mu, sigma=ranker.sigma) for crash_id in "ab"
+        }
 
         # Act
-        snapshot = ranker.snapshot()
+        for winner, loser in [("a", "b"), ("b", "a"), ("a", "b")]:
+            ranker.update_with_ordinal(_ordinal(winner, loser), weight=weight)
+            expected[winner], expected[loser] = rate_1vs1(
+                expected[winner], expected[loser], env=env
+            )
+
+        # Assert
+        for crash_id, rating in expected.items():
+            assert ranker.get_score(crash_id) == pytest.approx(rating.mu)
+            assert ranker.get_uncertainty(crash_id) == pytest.approx(rating.sigma)
+
+    def test_snapshot_contains_all_crashes(
+        self, updated_ranker: tuple[TrueSkillRanker, RankerState]
+    ) -> None:
+        """Snapshot should contain all crashes that have been seen."""
+        # Arrange & Act
+        _, snapshot = updated_ranker
 
         # Assert
-        assert "x" in snapshot["ratings"], "Snapshot should contain x"
-        assert "y" in snapshot["ratings"], "Snapshot should contain y"
-        assert "z" in snapshot["ratings"], "Snapshot should contain z"
+        assert "a" in snapshot["ratings"], "Snapshot should contain a"
+        assert "b" in snapshot["ratings"], "Snapshot should contain b"
+        assert "c" in snapshot["ratings"], "Snapshot should contain c"
 
-        for crash_id in ["x", "y", "z"]:
+        for crash_id in ["a", "b", "c"]:
             assert "mu" in snapshot["ratings"][crash_id], (
                 f"Snapshot should contain mu for {crash_id}"
             )